@@ -1,19 +1,25 @@
 import os
-from anthropic import Anthropic
 from notion_client import Client
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-import pickle
+from google_auth_httplib2 import AuthorizedHttp
+import httpx
 import datetime
-import json
+import time
 import re
-from langdetect import detect
 import logging
 import sys
 import zoneinfo
-from typing import Optional, Dict, Any
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 
 # Set up logging
@@ -28,12 +34,154 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+PARIS_TZ = zoneinfo.ZoneInfo("Europe/Paris")
+
+# Personal email providers, whose domains never identify a company
+FREE_EMAIL_DOMAINS = frozenset({
+    'gmail.com', 'googlemail.com', 'hotmail.com', 'hotmail.fr', 'hotmail.co.uk',
+    'outlook.com', 'outlook.fr', 'live.com', 'live.fr', 'msn.com',
+    'yahoo.com', 'yahoo.fr', 'yahoo.co.uk', 'ymail.com', 'rocketmail.com',
+    'icloud.com', 'me.com', 'mac.com', 'aol.com', 'aim.com',
+    'proton.me', 'protonmail.com', 'protonmail.ch', 'pm.me', 'tutanota.com',
+    'gmx.com', 'gmx.fr', 'gmx.de', 'gmx.net', 'web.de',
+    'mail.com', 'zoho.com', 'yandex.com', 'yandex.ru', 'mail.ru',
+    'fastmail.com', 'hey.com', 'qq.com', '163.com', '126.com',
+    'orange.fr', 'wanadoo.fr', 'free.fr', 'sfr.fr', 'neuf.fr',
+    'laposte.net', 'bbox.fr', 'numericable.fr', 'aliceadsl.fr', 'club-internet.fr',
+})
+
+# Notion property names for each kind of company entry
+_NAME_PROPERTY_BY_TYPE = {"customer": "Company name", "lead": "Lead name"}
+_RELATION_BY_TYPE = {"customer": "Customer", "lead": "Lead"}
+
+_EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
+_WORD_RE = re.compile(r"[^\W\d_]+")
+_EMAIL_TOKEN_RE = re.compile(r"\S+@\S+")
+
+# Markers used to tell French from English requests without a full classifier
+_FRENCH_CHARS = frozenset('àâéèêëîïôùûüç')
+_FRENCH_WORDS = frozenset({
+    'avec', 'demain', 'heure', 'heures', 'réunion', 'client', 'oui', 'le', 'la',
+    'les', 'un', 'une', 'pour', 'et', 'de', 'du', 'rendez', 'vous', 'prochain',
+    'lundi', 'mardi', 'mercredi', 'jeudi', 'vendredi', 'appel', 'premier'
+})
+_ENGLISH_WORDS = frozenset({
+    'tomorrow', 'meeting', 'with', 'at', 'am', 'pm', 'yes', 'the', 'a', 'an',
+    'for', 'and', 'of', 'schedule', 'call', 'next', 'monday', 'tuesday',
+    'wednesday', 'thursday', 'friday', 'first', 'today'
+})
+
+
+def detect_language(text: str) -> str:
+    """Detect whether a request is in French or English."""
+    # Email addresses carry no language signal (e.g. the ".de" TLD is not French)
+    lowered = _EMAIL_TOKEN_RE.sub(' ', text.lower())
+    words = set(_WORD_RE.findall(lowered))
+    fr_score = len(words & _FRENCH_WORDS) + len(_FRENCH_CHARS.intersection(lowered))
+    en_score = len(words & _ENGLISH_WORDS)
+    if fr_score != en_score:
+        return 'fr' if fr_score > en_score else 'en'
+    
+    # Fall back to the full classifier only when the markers are inconclusive
+    from langdetect import detect
+    return detect(text)
+
+
+@functools.lru_cache(maxsize=256)
+def _email_parts(email: str) -> Tuple[str, str, str]:
+    """Split an email into its local part, lowercased domain and organization label."""
+    local, domain = email.rsplit('@', 1)
+    domain = domain.lower()
+    return local, domain, domain.split('.', 1)[0]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_calendar_credentials() -> Credentials:
+    """Load (or obtain) the Google Calendar credentials once per process."""
+    logger.info("Setting up Google Calendar credentials")
+    SCOPES = [
+        'https://www.googleapis.com/auth/calendar',
+        'https://www.googleapis.com/auth/calendar.events',
+        'https://www.googleapis.com/auth/calendar.readonly'
+    ]
+    creds = None
+    migrated_pickle = False
+    
+    # One-time migration from the token.pickle file written by earlier versions
+    if not os.path.exists('token.json') and os.path.exists('token.pickle'):
+        logger.info("Migrating Google Calendar credentials from token.pickle to token.json")
+        import pickle
+        with open('token.pickle', 'rb') as token:
+            legacy_creds = pickle.load(token)
+        with open('token.json', 'w') as token:
+            token.write(legacy_creds.to_json())
+        migrated_pickle = True
+    
+    if os.path.exists('token.json'):
+        logger.info("Loading existing Google Calendar credentials from token.json")
+        try:
+            creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+        except ValueError as e:
+            # Incomplete credentials (e.g. no refresh token) go through a new authentication flow
+            logger.warning(f"Ignoring unusable credentials in token.json: {str(e)}")
+    
+    if not creds or not creds.valid:
+        logger.info("Refreshing Google Calendar credentials")
+        if creds and creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+        else:
+            logger.info("Initiating new Google Calendar authentication flow")
+            from google_auth_oauthlib.flow import InstalledAppFlow
+            flow = InstalledAppFlow.from_client_secrets_file(
+                os.environ.get('GOOGLE_CREDENTIALS_FILE'), SCOPES)
+            creds = flow.run_local_server(port=0, access_type='offline', prompt='consent')
+    
+        logger.info("Saving new credentials to token.json")
+        with open('token.json', 'w') as token:
+            token.write(creds.to_json())
+    
+    # Only drop the legacy token once working credentials are saved
+    if migrated_pickle:
+        logger.info("Removing migrated token.pickle")
+        os.remove('token.pickle')
+    
+    return creds
+
+
+@functools.lru_cache(maxsize=1)
+def _get_calendar_service():
+    """Build the Google Calendar service once per process.
+    
+    The service is shared between threads, but httplib2 connections are not
+    thread-safe, so its requests must be executed with _get_calendar_http().
+    """
+    logger.info("Setting up Google Calendar connection")
+    from googleapiclient.discovery import build
+    return build('calendar', 'v3', credentials=_get_calendar_credentials(), cache_discovery=False)
+
+
+_calendar_local = threading.local()
+
+
+def _get_calendar_http() -> AuthorizedHttp:
+    """Return the calling thread's authorized Google Calendar connection."""
+    http = getattr(_calendar_local, 'http', None)
+    if http is None:
+        from googleapiclient.http import build_http
+        http = AuthorizedHttp(_get_calendar_credentials(), http=build_http())
+        _calendar_local.http = http
+    return http
+
+
 class ValidationError(Exception):
     """Custom exception for validation errors."""
     pass
 
 class MeetingScheduler:
     DEFAULT_DURATION = 30  # minutes
+    COMPANY_CACHE_SIZE = 5  # most recent (email domain, company name) lookups
+    BATCH_POLL_INITIAL_DELAY = 5  # seconds
+    BATCH_POLL_MAX_DELAY = 300  # seconds
     REQUIRED_ENV_VARS = [
         'ANTHROPIC_API_KEY',
         'NOTION_API_KEY',
@@ -48,12 +196,19 @@ class MeetingScheduler:
         self.interactive = interactive
         self.validate_environment()
         
+        # Heavy SDK, imported only once the scheduler is actually needed
+        from anthropic import Anthropic
         self.anthropic = Anthropic(api_key=os.environ.get('ANTHROPIC_API_KEY'))
-        self.notion = Client(auth=os.environ.get('NOTION_API_KEY'))
+        # Share one HTTP/2 connection across all Notion calls, including concurrent ones
+        self.notion = Client(
+            auth=os.environ.get('NOTION_API_KEY'),
+            client=httpx.Client(http2=True)
+        )
         self.notion_database_id = os.environ.get('NOTION_DATABASE_ID')
         self.customers_database_id = os.environ.get('NOTION_CUSTOMERS_DATABASE_ID')
         self.leads_database_id = os.environ.get('NOTION_LEADS_DATABASE_ID')
-        self.google_service = self._setup_google_calendar()
+        self.google_service = _get_calendar_service()
+        self._company_cache: OrderedDict[Tuple[str, str], Optional[Dict]] = OrderedDict()
 
     def validate_environment(self):
         """Validate all required environment variables are set."""
@@ -62,37 +217,6 @@ class MeetingScheduler:
         if missing_vars:
             raise ValidationError(f"Missing required environment variables: {', '.join(missing_vars)}")
 
-    def _setup_google_calendar(self):
-        """Set up Google Calendar API connection."""
-        logger.info("Setting up Google Calendar connection")
-        SCOPES = [
-            'https://www.googleapis.com/auth/calendar',
-            'https://www.googleapis.com/auth/calendar.events',
-            'https://www.googleapis.com/auth/calendar.readonly'
-        ]
-        creds = None
-        
-        if os.path.exists('token.pickle'):
-            logger.info("Loading existing Google Calendar credentials from token.pickle")
-            with open('token.pickle', 'rb') as token:
-                creds = pickle.load(token)
-
-        if not creds or not creds.valid:
-            logger.info("Refreshing Google Calendar credentials")
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                logger.info("Initiating new Google Calendar authentication flow")
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    os.environ.get('GOOGLE_CREDENTIALS_FILE'), SCOPES)
-                creds = flow.run_local_server(port=0, access_type='offline', prompt='consent')
-            
-            logger.info("Saving new credentials to token.pickle")
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(creds, token)
-
-        return build('calendar', 'v3', credentials=creds)
-
     def validate_meeting_info(self, meeting_info: Dict[str, Any]) -> None:
         """Validate meeting information."""
         required_fields = ['title', 'datetime', 'attendee_email']
@@ -103,7 +227,7 @@ class MeetingScheduler:
         
         # Validate email format
         email = meeting_info['attendee_email']
-        if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
+        if not _EMAIL_RE.match(email):
             raise ValidationError(f"Invalid email format: {email}")
         
         # Validate datetime
@@ -112,70 +236,10 @@ class MeetingScheduler:
         except ValueError as e:
             raise ValidationError(f"Invalid datetime format: {str(e)}")
 
-    def should_create_company(self, company_name: str, email: str, lang: str) -> bool:
-        """Ask Claude whether to create a new company/lead entry."""
-        if not self.interactive:
-            return False
-            
-        system_prompt = """You are a business development assistant. 
-        Based on the company information provided, decide if we should create a new lead in our database.
-        Consider:
-        - Is this likely a real company?
-        - Does the email domain match the company name?
-        - Is this a business email (not gmail, hotmail, etc.)?
-        
-        Respond with a JSON containing:
-        {
-            "should_create": boolean,
-            "reason": string,
-            "suggested_type": "customer" or "lead"
-        }
-        """
-        
-        try:
-            message = self.anthropic.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=1000,
-                temperature=0,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": f"Company: {company_name}\nEmail: {email}"}
-                ]
-            )
-            
-            result = json.loads(message.content[0].text)
-            logger.info(f"Company creation recommendation: {result}")
-            
-            if result['should_create']:
-                # Ask for user confirmation
-                question = (
-                    f"\nSuggestion de créer un nouveau {result['suggested_type']}: {company_name}"
-                    if lang == 'fr' else
-                    f"\nSuggestion to create a new {result['suggested_type']}: {company_name}"
-                )
-                reason = (
-                    f"Raison: {result['reason']}"
-                    if lang == 'fr' else
-                    f"Reason: {result['reason']}"
-                )
-                confirm = (
-                    "Voulez-vous créer l'entrée ? (oui/non): "
-                    if lang == 'fr' else
-                    "Would you like to create the entry? (yes/no): "
-                )
-                
-                print(f"{question}\n{reason}")
-                response = input(confirm).lower()
-                return response in ['yes', 'oui', 'y', 'o']
-            
-            return False
-            
-        except Exception as e:
-            logger.error(f"Error in company creation decision: {str(e)}")
-            return False
-
     def create_company_entry(self, company_name: str, email: str, entry_type: str) -> Optional[Dict]:
         """Create a new company or lead entry in Notion."""
+        # Anything other than a customer is stored as a lead
+        entry_type = 'customer' if entry_type == 'customer' else 'lead'
         try:
             database_id = (
                 self.customers_database_id if entry_type == 'customer'
@@ -183,7 +247,7 @@ class MeetingScheduler:
             )
             
             # Use the correct property name based on entry type
-            name_property = "Company name" if entry_type == 'customer' else "Lead name"
+            name_property = _NAME_PROPERTY_BY_TYPE[entry_type]
             properties = {
                 name_property: {"title": [{"text": {"content": company_name}}]},
                 "Status": {"select": {"name": "New"}},
@@ -195,6 +259,9 @@ class MeetingScheduler:
             )
             
             logger.info(f"Created new {entry_type} entry: {company_name}")
+            _, domain, _ = _email_parts(email)
+            for cache_key in [key for key in self._company_cache if key[0] == domain]:
+                del self._company_cache[cache_key]
             return {'type': entry_type, 'data': new_entry}
             
         except Exception as e:
@@ -206,62 +273,14 @@ class MeetingScheduler:
         logger.info(f"Processing meeting request: {user_request}")
         
         # Detect language
-        lang = detect(user_request)
+        lang = detect_language(user_request)
         logger.info(f"Detected language: {lang}")
         
         try:
             # Get initial meeting details from Claude
             meeting_info = self._get_meeting_details(user_request, lang)
             
-            # Check for missing required information
-            required_fields = ['title', 'datetime', 'attendee_email']
-            missing_fields = [field for field in required_fields if not meeting_info.get(field)]
-            
-            if missing_fields and self.interactive:
-                logger.info(f"Missing information: {missing_fields}")
-                # Get missing information interactively
-                additional_info = self._get_missing_info(lang, meeting_info)
-                meeting_info.update(additional_info)
-            elif missing_fields:
-                raise ValidationError(f"Missing required information: {', '.join(missing_fields)}")
-            
-            # Validate the complete information
-            self.validate_meeting_info(meeting_info)
-            
-            # Extract company name from email if not provided
-            company_name = meeting_info.get('company_name') or self.extract_company_from_email(meeting_info['attendee_email'])
-            
-            # Look up company in databases
-            company_info = self.find_company_in_database(company_name, meeting_info['attendee_email'])
-            
-            # If company not found and in interactive mode, ask about creating it
-            if not company_info and self.interactive:
-                if lang == 'fr':
-                    print(f"\nEntreprise '{company_name}' non trouvée dans la base de données.")
-                    create = input("Voulez-vous créer une nouvelle entrée ? (oui/non): ").lower()
-                    if create in ['oui', 'o']:
-                        type_choice = input("Est-ce un client ou un lead ? (client/lead): ").lower()
-                        entry_type = 'customer' if type_choice == 'client' else 'lead'
-                else:
-                    print(f"\nCompany '{company_name}' not found in database.")
-                    create = input("Would you like to create a new entry? (yes/no): ").lower()
-                    if create in ['yes', 'y']:
-                        type_choice = input("Is this a customer or a lead? (customer/lead): ").lower()
-                        entry_type = type_choice
-                
-                if create in ['yes', 'y', 'oui', 'o']:
-                    company_info = self.create_company_entry(company_name, meeting_info['attendee_email'], entry_type)
-            
-            # Create calendar event and notion page
-            result = self._create_meeting_entries(meeting_info, company_info, lang)
-            
-            return {
-                "meet_link": result["meet_link"],
-                "notion_page_id": result["notion_page_id"],
-                "meeting_info": meeting_info,
-                "company_info": company_info,
-                "language": lang
-            }
+            return self._schedule_meeting(meeting_info, lang)
             
         except Exception as e:
             logger.error(f"Error in process_meeting_request: {str(e)}")
@@ -270,10 +289,99 @@ class MeetingScheduler:
                 f"Error during processing: {str(e)}"
             )
 
+    def process_meeting_requests_bulk(self, user_requests: List[str]) -> List[Dict[str, Any]]:
+        """Process many meeting requests through the Message Batches API.
+        
+        Only available in non-interactive mode, since batch results can take
+        up to 24 hours. Returns one result per request, in order; failed
+        requests get an "error" entry instead of raising.
+        """
+        if self.interactive:
+            raise ValidationError("Bulk processing is only available in non-interactive mode")
+        
+        if not user_requests:
+            return []
+        
+        logger.info(f"Processing {len(user_requests)} meeting requests in bulk")
+        langs = []
+        for user_request in user_requests:
+            try:
+                langs.append(detect_language(user_request))
+            except Exception as e:
+                # e.g. langdetect cannot classify an empty request
+                logger.warning(f"Could not detect language, defaulting to English: {str(e)}")
+                langs.append('en')
+        
+        try:
+            batch = self.anthropic.messages.batches.create(
+                requests=[
+                    {"custom_id": f"req-{i}", "params": self._meeting_details_params(user_request)}
+                    for i, user_request in enumerate(user_requests)
+                ]
+            )
+            logger.info(f"Created message batch: {batch.id}")
+            
+            # Poll with exponential backoff until the batch has finished
+            delay = self.BATCH_POLL_INITIAL_DELAY
+            while batch.processing_status != "ended":
+                time.sleep(delay)
+                delay = min(delay * 2, self.BATCH_POLL_MAX_DELAY)
+                batch = self.anthropic.messages.batches.retrieve(batch.id)
+                logger.info(f"Message batch {batch.id} status: {batch.processing_status}")
+            
+            entries = list(self.anthropic.messages.batches.results(batch.id))
+        except Exception as e:
+            logger.error(f"Error in process_meeting_requests_bulk: {str(e)}")
+            raise ValidationError(f"Error during bulk processing: {str(e)}")
+        
+        # Requests missing from the batch results keep this error entry
+        results: List[Dict[str, Any]] = [
+            {
+                "error": (
+                    "Erreur lors du traitement: aucun résultat de lot" if lang == 'fr' else
+                    "Error during processing: no batch result"
+                ),
+                "language": lang
+            }
+            for lang in langs
+        ]
+        for entry in entries:
+            index = int(entry.custom_id.split('-')[1])
+            lang = langs[index]
+            try:
+                if entry.result.type != "succeeded":
+                    raise ValidationError(f"Batch request {entry.custom_id} {entry.result.type}")
+                meeting_info = self._parse_meeting_details(entry.result.message.content[0].text)
+                results[index] = self._schedule_meeting(meeting_info, lang)
+            except Exception as e:
+                logger.error(f"Error processing batch request {entry.custom_id}: {str(e)}")
+                results[index] = {
+                    "error": (
+                        f"Erreur lors du traitement: {str(e)}" if lang == 'fr' else
+                        f"Error during processing: {str(e)}"
+                    ),
+                    "language": lang
+                }
+        
+        return results
+
     def _get_meeting_details(self, user_request: str, lang: str) -> Dict[str, Any]:
         """Get meeting details from Claude with proper error handling."""
-        paris_tz = zoneinfo.ZoneInfo("Europe/Paris")
-        current_date = datetime.datetime.now(paris_tz)
+        try:
+            message = self.anthropic.messages.create(**self._meeting_details_params(user_request))
+            return self._parse_meeting_details(message.content[0].text)
+            
+        except Exception as e:
+            error_msg = (
+                f"Erreur lors de l'analyse de la demande: {str(e)}"
+                if lang == 'fr' else
+                f"Error parsing meeting request: {str(e)}"
+            )
+            raise ValidationError(error_msg)
+
+    def _meeting_details_params(self, user_request: str) -> Dict[str, Any]:
+        """Build the Claude request parameters for extracting meeting details."""
+        current_date = datetime.datetime.now(PARIS_TZ)
         tomorrow = current_date + datetime.timedelta(days=1)
         
         system_prompt = """You are a bilingual (French/English) meeting scheduler assistant. Extract the following information from the meeting request:
@@ -284,7 +392,13 @@ class MeetingScheduler:
         - Attendee email / Email du participant
         - Company name (if specified explicitly) / Nom de l'entreprise (si spécifié explicitement)
         
-        Format your response as JSON with these exact keys: title, description, datetime, duration, attendee_email, company_name
+        Also decide whether the attendee's company should be created as a new entry in our database if it is not already there.
+        Consider:
+        - Is this likely a real company?
+        - Does the email domain match the company name?
+        - Is this a business email (not gmail, hotmail, etc.)?
+        
+        Format your response as JSON with these exact keys: title, description, datetime, duration, attendee_email, company_name, should_create_company, suggested_type, company_reason
         
         IMPORTANT:
         - If no explicit title is given, set title to "Meeting" (or "Réunion" in French)
@@ -292,6 +406,7 @@ class MeetingScheduler:
         - If duration is not specified, set it to 30 (default duration)
         - Extract email addresses even if they are at the end of the sentence
         - Always include any email address found in the text in attendee_email
+        - should_create_company is a boolean, suggested_type is "customer" or "lead", company_reason is a short explanation
         
         The input may be in French or English. Process it accordingly but always return the JSON with the same keys.
         For datetime, ALWAYS return in ISO format with the Europe/Paris timezone offset.
@@ -315,74 +430,142 @@ class MeetingScheduler:
             "datetime": "{tomorrow_date}T14:30:00+02:00",
             "duration": 30,
             "attendee_email": "vincent@keerok.tech",
-            "company_name": null
+            "company_name": null,
+            "should_create_company": true,
+            "suggested_type": "lead",
+            "company_reason": "keerok.tech is a business domain"
         }}
         """.format(
             current_date=current_date.strftime("%Y-%m-%d %H:%M:%S %Z"),
             tomorrow_date=tomorrow.strftime("%Y-%m-%d")
         )
         
-        try:
-            message = self.anthropic.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=1000,
-                temperature=0,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_request}
-                ]
-            )
-            
-            logger.info(f"Claude response: {message.content[0].text}")
-            meeting_info = json.loads(message.content[0].text)
-            
-            # Parse and validate the datetime
-            dt = datetime.datetime.fromisoformat(meeting_info['datetime'])
-            if not dt.tzinfo:
-                dt = dt.replace(tzinfo=paris_tz)
-            
-            # Log the original and processed times for debugging
-            logger.info(f"Original datetime from request: {meeting_info['datetime']}")
-            logger.info(f"Processed datetime: {dt.isoformat()}")
-            
-            # Update the datetime in the meeting_info
-            meeting_info['datetime'] = dt.isoformat()
-            
-            # Set duration if not specified
-            meeting_info['duration'] = int(meeting_info.get('duration', self.DEFAULT_DURATION))
-            
-            return meeting_info
-            
-        except Exception as e:
-            error_msg = (
-                f"Erreur lors de l'analyse de la demande: {str(e)}"
-                if lang == 'fr' else
-                f"Error parsing meeting request: {str(e)}"
-            )
-            raise ValidationError(error_msg)
+        return {
+            "model": "claude-3-sonnet-20240229",
+            "max_tokens": 1000,
+            "temperature": 0,
+            "system": system_prompt,
+            "messages": [
+                {"role": "user", "content": user_request}
+            ]
+        }
+
+    def _parse_meeting_details(self, response_text: str) -> Dict[str, Any]:
+        """Parse Claude's JSON response into normalized meeting information."""
+        logger.info(f"Claude response: {response_text}")
+        meeting_info = json_loads(response_text)
+        
+        # Parse and validate the datetime
+        dt = datetime.datetime.fromisoformat(meeting_info['datetime'])
+        if not dt.tzinfo:
+            dt = dt.replace(tzinfo=PARIS_TZ)
+        
+        # Log the original and processed times for debugging
+        logger.info(f"Original datetime from request: {meeting_info['datetime']}")
+        logger.info(f"Processed datetime: {dt.isoformat()}")
+        
+        # Update the datetime in the meeting_info, keeping the parsed value for later steps
+        meeting_info['datetime'] = dt.isoformat()
+        meeting_info['_start_time'] = dt
+        
+        # Set duration if not specified
+        meeting_info['duration'] = int(meeting_info.get('duration', self.DEFAULT_DURATION))
+        
+        # Keep the company recommendation apart from the meeting details shown to the user
+        meeting_info['_company_recommendation'] = {
+            key: meeting_info.pop(key, None)
+            for key in ('should_create_company', 'suggested_type', 'company_reason')
+        }
+        
+        return meeting_info
 
-    def _handle_company_info(self, meeting_info: Dict[str, Any], lang: str) -> Optional[Dict]:
-        """Handle company information with creation if needed."""
+    def _schedule_meeting(self, meeting_info: Dict[str, Any], lang: str) -> Dict[str, Any]:
+        """Complete, validate and schedule extracted meeting information."""
+        # Check for missing required information
+        required_fields = ['title', 'datetime', 'attendee_email']
+        missing_fields = [field for field in required_fields if not meeting_info.get(field)]
+        
+        if missing_fields and self.interactive:
+            logger.info(f"Missing information: {missing_fields}")
+            # Get missing information interactively
+            additional_info = self._get_missing_info(lang, meeting_info)
+            meeting_info.update(additional_info)
+        elif missing_fields:
+            raise ValidationError(f"Missing required information: {', '.join(missing_fields)}")
+        
+        # Validate the complete information
+        self.validate_meeting_info(meeting_info)
+        
+        # Extract company name from email if not provided
         company_name = meeting_info.get('company_name') or self.extract_company_from_email(meeting_info['attendee_email'])
+        meeting_info['_company_name'] = company_name
+        
+        # Look up company in databases
         company_info = self.find_company_in_database(company_name, meeting_info['attendee_email'])
         
-        if not company_info and self.should_create_company(company_name, meeting_info['attendee_email'], lang):
-            entry_type = 'lead'  # Default to lead for new entries
-            company_info = self.create_company_entry(company_name, meeting_info['attendee_email'], entry_type)
+        # A name derived from a personal email provider (e.g. "Gmail") is not a company
+        _, domain, _ = _email_parts(meeting_info['attendee_email'])
+        from_free_email = not meeting_info.get('company_name') and domain in FREE_EMAIL_DOMAINS
+        if not company_info and from_free_email:
+            logger.info(f"Skipping company creation for free email domain: {domain}")
         
-        return company_info
+        # If company not found and in interactive mode, ask about creating it
+        if not company_info and self.interactive and not from_free_email:
+            # Claude's recommendation comes with the meeting details; an empty type answer uses it
+            recommendation = meeting_info.get('_company_recommendation') or {}
+            logger.info(f"Company creation recommendation: {recommendation}")
+            suggested_type = recommendation.get('suggested_type')
+            if suggested_type not in ('customer', 'lead'):
+                suggested_type = 'lead'
+            
+            if lang == 'fr':
+                print(f"\nEntreprise '{company_name}' non trouvée dans la base de données.")
+                if recommendation.get('should_create_company'):
+                    suggested_label = 'client' if suggested_type == 'customer' else 'lead'
+                    print(f"Suggestion : créer un {suggested_label}. Raison : {recommendation.get('company_reason')}")
+                create = input("Voulez-vous créer une nouvelle entrée ? (oui/non): ").lower()
+                if create in ['oui', 'o']:
+                    type_choice = input("Est-ce un client ou un lead ? (client/lead): ").lower()
+                    if type_choice:
+                        entry_type = 'customer' if type_choice == 'client' else 'lead'
+                    else:
+                        entry_type = suggested_type
+            else:
+                print(f"\nCompany '{company_name}' not found in database.")
+                if recommendation.get('should_create_company'):
+                    print(f"Suggestion: create a {suggested_type}. Reason: {recommendation.get('company_reason')}")
+                create = input("Would you like to create a new entry? (yes/no): ").lower()
+                if create in ['yes', 'y']:
+                    type_choice = input("Is this a customer or a lead? (customer/lead): ").lower()
+                    entry_type = type_choice or suggested_type
+        
+            if create in ['yes', 'y', 'oui', 'o']:
+                company_info = self.create_company_entry(company_name, meeting_info['attendee_email'], entry_type)
+        
+        # Create calendar event and notion page
+        result = self._create_meeting_entries(meeting_info, company_info, lang)
+        
+        return {
+            "meet_link": result["meet_link"],
+            "notion_page_id": result["notion_page_id"],
+            "meeting_info": meeting_info,
+            "company_info": company_info,
+            "language": lang
+        }
 
     def _create_meeting_entries(self, meeting_info: Dict[str, Any], company_info: Optional[Dict], lang: str) -> Dict[str, Any]:
         """Create calendar event and notion page with proper error handling."""
         try:
             # Set up the meeting time
-            start_time = datetime.datetime.fromisoformat(meeting_info['datetime'])
+            start_time = meeting_info.get('_start_time')
+            if start_time is None:
+                start_time = datetime.datetime.fromisoformat(meeting_info['datetime'])
             if not start_time.tzinfo:
-                paris_tz = zoneinfo.ZoneInfo("Europe/Paris")
-                start_time = start_time.replace(tzinfo=paris_tz)
+                start_time = start_time.replace(tzinfo=PARIS_TZ)
             
-            # Extract company name from email if not provided in meeting_info
+            # Reuse the company name resolved while scheduling, or extract it from the email
             company_name = (
+                meeting_info.get('_company_name') or
                 meeting_info.get('company_name') or 
                 self.extract_company_from_email(meeting_info['attendee_email'])
             )
@@ -390,7 +573,7 @@ class MeetingScheduler:
             # Get company name for display
             display_company_name = self.get_company_name_from_info(company_info) or company_name
             
-            # Create Google Meet link
+            # Create Google Meet link first so the Notion page can include it
             meet_link = self.create_meet_link(
                 meeting_info['title'],
                 start_time,
@@ -399,19 +582,12 @@ class MeetingScheduler:
                 display_company_name
             )
             
-            # Create Notion page
+            # Create Notion page with the Meet link
             notion_page = self.create_meeting_notes_page(
                 meeting_info['title'],
                 company_info,
-                start_time
-            )
-            
-            # Update with Meet link
-            self.notion.pages.update(
-                page_id=notion_page['id'],
-                properties={
-                    "Google Meet": {"url": meet_link}
-                }
+                start_time,
+                meet_link
             )
             
             return {
@@ -429,75 +605,152 @@ class MeetingScheduler:
 
     def extract_company_from_email(self, email: str) -> str:
         """Extract company name from email domain."""
-        domain = email.split('@')[1]
+        _, domain, org = _email_parts(email)
         # Get both full domain and first part
         company_full = domain.capitalize()
-        company_name = domain.split('.')[0].capitalize()
+        company_name = org.capitalize()
         logger.info(f"Extracted company names: full='{company_full}', name='{company_name}'")
         return company_name
 
     def find_company_in_database(self, company_name: str, email: str) -> Optional[Dict]:
-        """Search for company in both customers and leads databases."""
-        # Try different variations of the company name
-        company_variations = [
+        """Search for company in both customers and leads databases, reusing recent lookups."""
+        _, domain, org = _email_parts(email)
+        cache_key = (domain, company_name.lower())
+        if cache_key in self._company_cache:
+            logger.info(f"Using cached company lookup for: {cache_key}")
+            self._company_cache.move_to_end(cache_key)
+            return self._company_cache[cache_key]
+        
+        # One workspace search covers both databases. A name derived from a free
+        # email domain (e.g. "Gmail") never names the company, so skip searching it.
+        search_info = None
+        if not (domain in FREE_EMAIL_DOMAINS and company_name.lower() == org):
+            search_info, _ = self._search_company_pages(company_name)
+        if search_info and search_info['type'] == 'customer':
+            company_info, complete = search_info, True
+        else:
+            # A customer matching the domain label still takes precedence over a lead found by search
+            company_info, complete = self._search_company_databases(company_name, org)
+            company_info = company_info or search_info
+        
+        # Don't remember a result a failed query may have gotten wrong
+        if complete:
+            self._company_cache[cache_key] = company_info
+            self._company_cache.move_to_end(cache_key)
+            if len(self._company_cache) > self.COMPANY_CACHE_SIZE:
+                self._company_cache.popitem(last=False)
+        
+        return company_info
+
+    def _search_company_pages(self, query: str) -> Tuple[Optional[Dict], bool]:
+        """Search the workspace for a customer or lead page matching the query.
+        
+        Returns the match (if any) and whether the search completed without errors.
+        """
+        logger.info(f"Searching workspace pages for: {query}")
+        try:
+            results = self.notion.search(
+                query=query,
+                filter={"property": "object", "value": "page"}
+            ).get('results', [])
+        except Exception as e:
+            logger.error(f"Error searching workspace pages: {str(e)}")
+            return None, False
+        
+        # Map results back to their database; IDs may be configured with or without dashes
+        type_by_database = {
+            self.customers_database_id.replace('-', '').lower(): 'customer',
+            self.leads_database_id.replace('-', '').lower(): 'lead',
+        }
+        matches = {}
+        for page in results:
+            database_id = page.get('parent', {}).get('database_id') or ''
+            entry_type = type_by_database.get(database_id.replace('-', '').lower())
+            if entry_type and entry_type not in matches:
+                matches[entry_type] = page
+        
+        # Customers take precedence over leads
+        for entry_type in ('customer', 'lead'):
+            if entry_type in matches:
+                company_info = {'type': entry_type, 'data': matches[entry_type]}
+                logger.info(f"Found company in {entry_type}s database: {self.get_company_name_from_info(company_info)}")
+                return company_info, True
+        
+        return None, True
+
+    def _search_company_databases(self, company_name: str, org: str) -> Tuple[Optional[Dict], bool]:
+        """Search for company in both customers and leads databases.
+        
+        Returns the match (if any) and whether every query completed without errors.
+        """
+        # Try different variations of the company name. Notion's "contains" is
+        # case-insensitive, so case variants are collapsed, and the full domain
+        # is already covered by a match on its first label.
+        candidates = [
             company_name,  # Original name
-            company_name.lower(),  # Lowercase
-            company_name.upper(),  # Uppercase
-            email.split('@')[1].split('.')[0].capitalize(),  # Just domain name
-            email.split('@')[1].capitalize(),  # Full domain
+            org.capitalize(),  # Just domain name
         ]
+        company_variations = list({
+            variation.lower(): variation for variation in candidates
+        }.values())
         logger.info(f"Searching for company variations: {company_variations}")
         
-        # Search in customers database
-        logger.info("Searching in customers database")
+        # Query customers and leads databases concurrently
+        logger.info("Searching in customers and leads databases")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            customer_future = executor.submit(
+                self._query_company_database,
+                self.customers_database_id,
+                _NAME_PROPERTY_BY_TYPE['customer'],
+                company_variations
+            )
+            lead_future = executor.submit(
+                self._query_company_database,
+                self.leads_database_id,
+                _NAME_PROPERTY_BY_TYPE['lead'],
+                company_variations
+            )
+
+        # Customers take precedence over leads
+        complete = True
         try:
-            customer_results = self.notion.databases.query(
-                database_id=self.customers_database_id,
-                filter={
-                    "or": [
-                        {
-                            "property": "Company name",
-                            "title": {
-                                "contains": variation
-                            }
-                        } for variation in company_variations
-                    ]
-                }
-            ).get('results', [])
-            
+            customer_results = customer_future.result()
             if customer_results:
                 found_name = self.get_company_name_from_info({'type': 'customer', 'data': customer_results[0]})
                 logger.info(f"Found company in customers database: {found_name}")
-                return {'type': 'customer', 'data': customer_results[0]}
+                return {'type': 'customer', 'data': customer_results[0]}, True
         except Exception as e:
             logger.error(f"Error searching customers database: {str(e)}")
+            complete = False
 
-        # Search in leads database
-        logger.info("Searching in leads database")
         try:
-            lead_results = self.notion.databases.query(
-                database_id=self.leads_database_id,
-                filter={
-                    "or": [
-                        {
-                            "property": "Lead name",
-                            "title": {
-                                "contains": variation
-                            }
-                        } for variation in company_variations
-                    ]
-                }
-            ).get('results', [])
-            
+            lead_results = lead_future.result()
             if lead_results:
                 found_name = self.get_company_name_from_info({'type': 'lead', 'data': lead_results[0]})
                 logger.info(f"Found company in leads database: {found_name}")
-                return {'type': 'lead', 'data': lead_results[0]}
+                return {'type': 'lead', 'data': lead_results[0]}, complete
         except Exception as e:
             logger.error(f"Error searching leads database: {str(e)}")
+            complete = False
 
         logger.warning(f"Company not found in any database for variations: {company_variations}")
-        return None
+        return None, complete
+
+    def _query_company_database(self, database_id: str, name_property: str, variations: List[str]) -> List[Dict]:
+        """Query a companies database for any of the given name variations."""
+        return self.notion.databases.query(
+            database_id=database_id,
+            filter={
+                "or": [
+                    {
+                        "property": name_property,
+                        "title": {
+                            "contains": variation
+                        }
+                    } for variation in variations
+                ]
+            }
+        ).get('results', [])
 
     def get_company_name_from_info(self, company_info: Optional[Dict]) -> Optional[str]:
         """Extract company name from company_info."""
@@ -506,13 +759,13 @@ class MeetingScheduler:
         
         try:
             # Use correct property names for each type
-            property_name = "Company name" if company_info['type'] == 'customer' else "Lead name"
+            property_name = _NAME_PROPERTY_BY_TYPE[company_info['type']]
             return company_info['data']['properties'][property_name]['title'][0]['text']['content']
         except (KeyError, IndexError) as e:
             logger.error(f"Error extracting company name from info: {str(e)}")
             return None
 
-    def create_meeting_notes_page(self, title: str, company_info: Optional[Dict], date: datetime.datetime) -> Dict:
+    def create_meeting_notes_page(self, title: str, company_info: Optional[Dict], date: datetime.datetime, meet_link: Optional[str] = None) -> Dict:
         """Create a new page for meeting notes using the template."""
         company_name = self.get_company_name_from_info(company_info) or title
         meeting_title = f"Meeting with {company_name}"
@@ -523,10 +776,13 @@ class MeetingScheduler:
             "Status": {"select": {"name": "Planned"}},
             "Meeting date": {"date": {"start": date.isoformat()}}
         }
+        
+        if meet_link:
+            properties["Google Meet"] = {"url": meet_link}
 
         # Link to customer/lead if found
         if company_info:
-            relation_key = "Customer" if company_info['type'] == 'customer' else "Lead"
+            relation_key = _RELATION_BY_TYPE[company_info['type']]
             properties[relation_key] = {
                 "relation": [{"id": company_info['data']['id']}]
             }
@@ -552,8 +808,7 @@ class MeetingScheduler:
         
         # Ensure we're using the exact time provided
         if not start_time.tzinfo:
-            paris_tz = zoneinfo.ZoneInfo("Europe/Paris")
-            start_time = start_time.replace(tzinfo=paris_tz)
+            start_time = start_time.replace(tzinfo=PARIS_TZ)
         
         # Log the exact time being used
         logger.info(f"Creating meeting at exactly: {start_time.strftime('%Y-%m-%d %H:%M:%S %Z')}")
@@ -585,7 +840,7 @@ class MeetingScheduler:
                 body=event,
                 conferenceDataVersion=1,
                 sendUpdates='all'
-            ).execute()
+            ).execute(http=_get_calendar_http())
             
             meet_link = event.get('hangoutLink')
             logger.info(f"Created Google Meet link: {meet_link}")
@@ -614,7 +869,7 @@ class MeetingScheduler:
         if 'attendee_email' not in meeting_info:
             while 'attendee_email' not in info:
                 email = input(email_prompt).strip()
-                if re.match(r"[^@]+@[^@]+\.[^@]+", email):
+                if _EMAIL_RE.match(email):
                     info['attendee_email'] = email
                 else:
                     print("Invalid email format. Please try again." if lang == 'en' else "Format d'email invalide. Veuillez réessayer.")
@@ -665,7 +920,8 @@ def display_results(result: Dict[str, Any]) -> None:
         print(f"ID de la page Notion : {result['notion_page_id']}")
         print("\nDétails de la réunion :")
         for key, value in result['meeting_info'].items():
-            print(f"{key}: {value}")
+            if not key.startswith('_'):
+                print(f"{key}: {value}")
         
         if result['company_info']:
             print(f"\nEntreprise trouvée dans la base de données {result['company_info']['type']} !")
@@ -678,7 +934,8 @@ def display_results(result: Dict[str, Any]) -> None:
         print(f"Notion page ID: {result['notion_page_id']}")
         print("\nMeeting details:")
         for key, value in result['meeting_info'].items():
-            print(f"{key}: {value}")
+            if not key.startswith('_'):
+                print(f"{key}: {value}")
         
         if result['company_info']:
             print(f"\nCompany found in {result['company_info']['type']} database!")